@@ -9,8 +9,9 @@ import re
 import sys
 import subprocess
 import importlib
+import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from threading import get_ident
 
 # Auto-install missing packages
 def install_and_import(package_name, import_name=None):
@@ -30,15 +31,45 @@ def install_and_import(package_name, import_name=None):
             print(f"✗ Failed to install {package_name}: {e}")
             sys.exit(1)
 
+# Install brotli before requests/urllib3 are imported, they only pick up a
+# brotli decoder (and advertise 'br' in Accept-Encoding) if it is importable then
+try:
+    install_and_import("brotli")
+except:
+    print("⚠ brotli not available, pages will be requested without brotli compression")
+
 # Install and import required packages
 requests = install_and_import("requests")
+from urllib3.util.retry import Retry
 bs4 = install_and_import("beautifulsoup4", "bs4")
 BeautifulSoup = bs4.BeautifulSoup
+SoupStrainer = bs4.SoupStrainer
 PIL = install_and_import("Pillow", "PIL")
-from PIL import Image
-reportlab = install_and_import("reportlab")
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from PIL import Image, ImageFile, ImageOps, features
+# Keep the page from a truncated download (the missing rows are left grey) instead of failing it
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+if not features.check_feature("libjpeg_turbo"):
+    print("⚠ Pillow is not using libjpeg-turbo, JPEG decoding and encoding will be slower")
+img2pdf = install_and_import("img2pdf")
+install_and_import("tqdm")
+from tqdm import tqdm
+
+# Prefer the C-backed lxml parser, falling back to the pure-Python html.parser
+try:
+    install_and_import("lxml")
+    HTML_PARSER = "lxml"
+except:
+    HTML_PARSER = "html.parser"
+    print("⚠ lxml not available, using the slower built-in HTML parser")
+
+# Try to import httpx so images can be fetched over multiplexed HTTP/2 connections
+try:
+    install_and_import("httpx[http2]", "h2")
+    httpx = install_and_import("httpx")
+    HAS_HTTPX = True
+except:
+    HAS_HTTPX = False
+    print("⚠ httpx not available, images will be downloaded over HTTP/1.1")
 
 # Try to import cloudscraper for Cloudflare bypass
 try:
@@ -51,68 +82,415 @@ except:
 # Standard library imports
 from pathlib import Path
 from io import BytesIO
+import atexit
+import contextlib
+import hashlib
+import json
+import shutil
 import tempfile
-import time
-import tkinter as tk
-from tkinter import filedialog
+from http.cookiejar import LoadError, MozillaCookieJar
+from urllib.parse import urljoin, urlparse
+
+# Persistent cache of page/image bodies and their HTTP validators
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".img2pdf_cache")
+CACHE_LIMIT = 1 << 30  # Bytes of bodies kept, the least recently used are removed past this
+
+# Set IMG2PDF_DEBUG=1 to print request/response details and every downloaded image
+DEBUG = os.environ.get("IMG2PDF_DEBUG", "").strip().lower() not in ("", "0", "false", "no", "off")
+
+
+class ResponseCache:
+    """Store ETag/Last-Modified validators and bodies per URL.
+
+    Cached pages are re-requested with If-None-Match/If-Modified-Since, so a
+    server that answers 304 Not Modified costs no body transfer on re-runs.
+    Images are revalidated the same way. Images without validators have
+    nothing to revalidate with, so their cached copy is reused without a
+    request until it is evicted.
+
+    Each URL is kept as its body plus a small JSON sidecar holding its
+    validators, both named after a hash of the URL. There is no shared
+    index, so several instances of the script can use the cache at once.
+    Every file is written under a temporary name and renamed into place.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def body_path(self, url):
+        """Return the file holding the cached body of a URL."""
+        key = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def conditional_headers(self, url):
+        """Return the validator headers to send for a cached URL."""
+        entry = self._entry(url)
+        if not entry or not os.path.exists(self.body_path(url)):
+            return {}
+
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def contains(self, url):
+        """Check whether a complete body is cached for a URL."""
+        return self._entry(url) is not None and os.path.exists(self.body_path(url))
+
+    def open(self, url):
+        """Open the cached body of a URL for reading."""
+        path = self.body_path(url)
+        try:
+            os.utime(path)  # Mark it as recently used for prune()
+        except OSError:
+            pass
+        return open(path, 'rb')
+
+    def evict(self, url):
+        """Forget a cached URL, e.g. one whose body turned out to be unusable."""
+        path = self.body_path(url)
+        for stale in (path, f"{path}.json"):
+            with contextlib.suppress(OSError):
+                os.remove(stale)
+
+    def prune(self, max_bytes):
+        """Remove the least recently used bodies until at most max_bytes are kept."""
+        bodies = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                # Bodies are bare hashes, sidecars and cookie files have an extension
+                if '.' not in entry.name and entry.is_file():
+                    stat = entry.stat()
+                    bodies.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in bodies)
+        for _, size, path in sorted(bodies):
+            if total <= max_bytes:
+                break
+            for stale in (path, f"{path}.json"):
+                with contextlib.suppress(OSError):
+                    os.remove(stale)
+            total -= size
+
+    def read_text(self, url):
+        """Return the cached body of a URL decoded as text."""
+        encoding = self._entry(url)['encoding']
+        with self.open(url) as f:
+            return f.read().decode(encoding or 'utf-8', errors='replace')
+
+    def store_stream(self, url, response, chunks, check=None):
+        """Stream a response body into the cache and return it opened for reading.
+
+        If given, check is called with the path of the downloaded body and
+        must return True for it to be kept, otherwise ValueError is raised.
+        """
+        validators = self._validators(response) or (None, None)
+
+        path = self.body_path(url)
+        partial_path = self._partial_path(path)
+        try:
+            self._write_chunks(partial_path, chunks, self._body_length(response))
+            if check is not None and not check(partial_path):
+                raise ValueError("response body is not an image")
+            os.replace(partial_path, path)
+        except Exception:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        self._remember(url, validators, None)
+        return self.open(url)
+
+    def store_text(self, url, response):
+        """Cache an already-read text response if it carries validators."""
+        validators = self._validators(response)
+        if validators is None:
+            return
+
+        # The page is already in memory, failing to cache it only costs a re-download
+        path = self.body_path(url)
+        partial_path = self._partial_path(path)
+        try:
+            with open(partial_path, 'wb') as f:
+                f.write(response.content)
+            os.replace(partial_path, path)
+            self._remember(url, validators, response.encoding)
+        except OSError:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    def _write_chunks(self, path, chunks, length):
+        """Write chunks straight to a file descriptor, bypassing buffered IO.
+
+        The file is preallocated to the expected length (where the platform
+        supports it) so concurrent downloads don't fragment the cache.
+        """
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            if length and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(fd, 0, length)
+                except OSError:
+                    pass  # Not supported by this filesystem
+            written = 0
+            for chunk in chunks:
+                view = memoryview(chunk)
+                while view:
+                    n = os.write(fd, view)
+                    view = view[n:]
+                    written += n
+            if written != length:
+                os.ftruncate(fd, written)
+        finally:
+            os.close(fd)
+
+    def _body_length(self, response):
+        # Content-Length is the encoded size, it only matches the decoded body
+        # when the server didn't compress it
+        if response.headers.get('Content-Encoding', 'identity') != 'identity':
+            return None
+        try:
+            return int(response.headers.get('Content-Length'))
+        except (TypeError, ValueError):
+            return None
+
+    def _validators(self, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return None
+        return etag, last_modified
+
+    def _partial_path(self, path):
+        # Unique per process and thread, so concurrent writers never share a file
+        return f"{path}.{os.getpid()}-{get_ident()}.part"
+
+    def _entry(self, url):
+        try:
+            with open(f"{self.body_path(url)}.json", encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def _remember(self, url, validators, encoding):
+        etag, last_modified = validators
+        entry = {'url': url, 'etag': etag, 'last_modified': last_modified, 'encoding': encoding}
+        path = f"{self.body_path(url)}.json"
+        partial_path = self._partial_path(path)
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(partial_path, path)
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """Return the process-wide response cache, opening it on first use.
+
+    The cache only saves requests, so if CACHE_DIR can't be used the run
+    continues with a temporary one that is removed on exit.
+    """
+    global _response_cache
+    if _response_cache is None:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            if not os.access(CACHE_DIR, os.W_OK):
+                raise PermissionError(f"{CACHE_DIR} is not writable")
+            cache_dir = CACHE_DIR
+        except OSError as e:
+            print(f"⚠ Warning: Could not use the cache in {CACHE_DIR} ({e}), nothing will be kept between runs")
+            cache_dir = temporary_cache_dir()
+        _response_cache = ResponseCache(cache_dir)
+        if cache_dir == CACHE_DIR:
+            with contextlib.suppress(OSError):
+                _response_cache.prune(CACHE_LIMIT)
+    return _response_cache
+
+
+def disable_persistent_cache():
+    """Keep this run's downloads (and cookies) in a temporary cache removed on exit."""
+    global _response_cache
+    _response_cache = ResponseCache(temporary_cache_dir())
+
+
+def temporary_cache_dir():
+    cache_dir = tempfile.mkdtemp(prefix="img2pdf_")
+    atexit.register(shutil.rmtree, cache_dir, True)
+    return cache_dir
+
+
+# One session per origin, shared by every downloader in the process so the
+# Cloudflare challenge is solved (and connections are opened) only once
+_sessions = {}
 
 
 class ImageToPDFDownloader:
-    def __init__(self, url, cookies_file=None):
+    # Patterns used on every page/image URL, compiled once
+    _RE_IMAGE_EXT = re.compile(r'\.(?:jpe?g|png|gif|webp|bmp)(?:[?#]|$)', re.I)
+    _RE_STYLES = re.compile(r'/styles/[^/]+/public/')
+    _RE_ITOK = re.compile(r'[?&]itok=([^&]+)')
+    _RE_LEADING_NUM = re.compile(r'^(\d+)[\W_]')
+    _RE_UNDER_NUM = re.compile(r'[\W_](\d+)\.')
+    _RE_ANY_NUM = re.compile(r'(\d+)')
+    _RE_URL_PATTERN = re.compile(r'(.*?)(-\d+)?/?$')
+    _RE_PAGINATE = re.compile(r'(.*?)[-/](\d+)/?$')
+    _RE_CONTROL = re.compile(r'control', re.I)
+    _RE_CONTENT_ID = re.compile(r'content|main|comic|image', re.I)
+    _RE_MAIN = re.compile(r'main|comic|content|gallery|primary', re.I)
+    _RE_NEXT_CLS = re.compile(r'next|pagGaleria', re.I)
+    _RE_NEXT_TEXT = tuple(re.compile(keyword, re.I) for keyword in ['next image', 'next page', 'next >>', '>>'])
+
+    # The empty IEND chunk (length, type and CRC) every complete PNG ends with
+    _PNG_IEND = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+
+    # Characters that aren't allowed in filenames, mapped to '_'
+    _TITLE_UNSAFE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+    # extract_images only looks at these tags, so the rest of the page is not built into the tree
+    _IMAGE_TAGS = SoupStrainer(['title', 'noscript', 'img'])
+
+    # detect_related_chapters only needs the dropdowns and their options. The
+    # class is matched afterwards, strainers see it before it's split into a list
+    _SELECT_TAGS = SoupStrainer('select')
+
+    # is_paginated_gallery only looks for navigation control divs
+    _CONTROL_DIVS = SoupStrainer('div', id=_RE_CONTROL)
+
+    def __init__(self, url, cookies_file=None, verbose=DEBUG, max_dim=2000, max_workers=None, session=None):
         self.url = url
         self.cookies_file = cookies_file
+        self.verbose = verbose  # Print request/response details and every downloaded image
+        self.max_dim = max_dim  # Widest page in pixels, None keeps the original size
+        self.max_workers = max_workers  # Concurrent image downloads, None sizes it to the chapter
+        self.images = []
+        self.cache = get_response_cache()
+        self.http2_blocked = False  # The image host refused the HTTP/2 client this chapter
+
+        origin = urlparse(url).netloc
+        if session is None:
+            session = _sessions.get(origin)
+
+        if session is not None:
+            # Share the caller's (or this origin's) session so its pooled
+            # keep-alive connections and cookies carry over instead of
+            # re-doing DNS, TLS and the Cloudflare challenge
+            self.session = session
+            self.session.headers['Referer'] = self.url
+            return
+
+        self.session = _sessions[origin] = self.create_session()
+
+        # Start from the cookies an earlier run earned on this origin
+        saved_cookies = self.saved_cookies_file(origin)
+        if os.path.exists(saved_cookies):
+            self.load_cookies(saved_cookies)
+        atexit.register(self.save_cookies, saved_cookies)
 
+        # Load cookies if provided
+        if cookies_file and os.path.exists(cookies_file):
+            self.load_cookies(cookies_file)
+
+    def create_session(self):
+        """Create a browser-like session with a connection pool sized for the download workers."""
         # Use cloudscraper if available for Cloudflare bypass, otherwise use requests
         if HAS_CLOUDSCRAPER:
             print("✓ Using cloudscraper for Cloudflare bypass")
-            self.session = cloudscraper.create_scraper()
+            session = cloudscraper.create_scraper()
         else:
-            self.session = requests.Session()
-
-        self.images = []
-        self.temp_dir = tempfile.mkdtemp()
+            session = requests.Session()
+
+        # Size the connection pool for the download workers so keep-alive
+        # connections are reused instead of being discarded and re-handshaked.
+        # The mounted adapters are resized in place so cloudscraper's cipher
+        # suite adapter (needed for the Cloudflare bypass) is preserved.
+        # cloudscraper recognizes a challenge by its 429/503 response, so those
+        # must reach it rather than being retried away by urllib3. Once retries
+        # run out, the last response is returned instead of raising RetryError.
+        if HAS_CLOUDSCRAPER:
+            retry_statuses = [500, 502, 504]
+        else:
+            retry_statuses = [429, 500, 502, 503, 504]
+        for adapter in session.adapters.values():
+            adapter.max_retries = Retry(
+                total=3, backoff_factor=0.3, status_forcelist=retry_statuses, raise_on_status=False
+            )
+            adapter.init_poolmanager(16, 32)
 
         # Set a realistic user agent and other headers to mimic a browser
-        self.session.headers.update({
+        session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
             'Accept-Language': 'en-US,en;q=0.9',
             'Referer': self.url
         })
-
-        # Load cookies if provided
-        if cookies_file and os.path.exists(cookies_file):
-            self.load_cookies(cookies_file)
+        return session
 
     def load_cookies(self, cookies_file):
         """Load cookies from Netscape format cookie file."""
         try:
-            cookies_loaded = 0
-            with open(cookies_file, 'r') as f:
-                for line in f:
-                    if not line.strip() or line.startswith('#'):
-                        continue
-
-                    parts = line.strip().split('\t')
-                    if len(parts) >= 7:
-                        domain, _, path, secure, _, name, value = parts[:7]
-                        self.session.cookies.set(name, value, domain=domain, path=path)
-                        cookies_loaded += 1
+            jar = MozillaCookieJar(cookies_file)
+            try:
+                jar.load(ignore_discard=True, ignore_expires=True)
+                self.session.cookies.update(jar)
+                cookies_loaded = len(jar)
+            except LoadError:
+                # No "# Netscape HTTP Cookie File" header or malformed lines,
+                # read the tab-separated fields directly instead
+                cookies_loaded = self.load_cookie_lines(cookies_file)
             print(f"✓ Loaded {cookies_loaded} cookies from {cookies_file}")
         except Exception as e:
             print(f"⚠ Warning: Could not load cookies: {e}")
 
+    def saved_cookies_file(self, origin):
+        """Return the file the session cookies of an origin are kept in between runs."""
+        key = hashlib.blake2b(origin.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.cache.cache_dir, f"cookies-{key}.txt")
+
+    def save_cookies(self, cookies_file):
+        """Save the session cookies (e.g. a solved Cloudflare challenge) in Netscape format."""
+        if not self.session.cookies:
+            return
+
+        try:
+            jar = MozillaCookieJar(cookies_file)
+            for cookie in self.session.cookies:
+                jar.set_cookie(cookie)
+            jar.save(ignore_discard=True, ignore_expires=True)
+        except Exception as e:
+            print(f"⚠ Warning: Could not save cookies: {e}")
+
+    def load_cookie_lines(self, cookies_file):
+        """Load cookies line by line from a loosely formatted cookie file."""
+        cookies_loaded = 0
+        with open(cookies_file, 'r') as f:
+            for line in f:
+                # HttpOnly cookies are written as "#HttpOnly_<domain>", they aren't comments
+                if line.startswith('#HttpOnly_'):
+                    line = line[len('#HttpOnly_'):]
+                if not line.strip() or line.startswith('#'):
+                    continue
+
+                parts = line.strip().split('\t')
+                if len(parts) >= 7:
+                    domain, _, path, secure, _, name, value = parts[:7]
+                    self.session.cookies.set(name, value, domain=domain, path=path)
+                    cookies_loaded += 1
+        return cookies_loaded
+
     def fetch_page(self):
         """Fetch the webpage content."""
         try:
             print(f"Fetching page: {self.url}")
-            print(f"\n📋 Debug Info:")
-            print(f"  Total cookies loaded: {len(self.session.cookies)}")
 
             # Add more complete headers for each request
             headers = {
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-                'Accept-Encoding': 'gzip, deflate, br',
+                # Only advertise encodings urllib3 can actually decode
+                'Accept-Encoding': requests.utils.DEFAULT_ACCEPT_ENCODING,
                 'Accept-Language': 'en-US,en;q=0.9',
                 'Cache-Control': 'max-age=0',
                 'Referer': self.url,
@@ -123,51 +501,73 @@ class ImageToPDFDownloader:
                 'Upgrade-Insecure-Requests': '1'
             }
 
-            print(f"  Headers being sent:")
-            for key, value in headers.items():
-                if len(str(value)) > 60:
-                    print(f"    {key}: {str(value)[:60]}...")
-                else:
-                    print(f"    {key}: {value}")
-
-            # Show some cookies
-            if self.session.cookies:
-                print(f"  Sample cookies:")
-                for i, cookie in enumerate(self.session.cookies):
-                    if i < 3:
-                        print(f"    {cookie.name}={cookie.value[:20]}...")
-                    if i >= 3:
-                        break
-
-            response = self.session.get(self.url, headers=headers, timeout=30, allow_redirects=True, verify=True)
-
-            print(f"\n📊 Response Info:")
-            print(f"  Status Code: {response.status_code}")
-            print(f"  Content Type: {response.headers.get('Content-Type', 'N/A')}")
-            print(f"  Content Length: {len(response.text)} bytes")
-            print(f"  Response Headers:")
-            for key, value in response.headers.items():
-                if key.lower() in ['server', 'set-cookie', 'content-type', 'content-length']:
-                    print(f"    {key}: {value[:100] if len(str(value)) > 100 else value}")
-
-            response.raise_for_status()
-            return response.text
+            if self.verbose:
+                print(f"\n📋 Debug Info:")
+                print(f"  Total cookies loaded: {len(self.session.cookies)}")
+                print(f"  Headers being sent:")
+                for key, value in headers.items():
+                    if len(str(value)) > 60:
+                        print(f"    {key}: {str(value)[:60]}...")
+                    else:
+                        print(f"    {key}: {value}")
+
+                # Show some cookies
+                if self.session.cookies:
+                    print(f"  Sample cookies:")
+                    for i, cookie in enumerate(self.session.cookies):
+                        if i < 3:
+                            print(f"    {cookie.name}={cookie.value[:20]}...")
+                        if i >= 3:
+                            break
+
+            response, html_content = self.get_page(self.url, headers=headers)
+
+            if self.verbose:
+                print(f"\n📊 Response Info:")
+                print(f"  Status Code: {response.status_code}")
+                if response.status_code == 304:
+                    print("  Not modified, using cached copy")
+                print(f"  Content Type: {response.headers.get('Content-Type', 'N/A')}")
+                print(f"  Content Length: {len(html_content)} bytes")
+                print(f"  Response Headers:")
+                for key, value in response.headers.items():
+                    if key.lower() in ['server', 'set-cookie', 'content-type', 'content-length']:
+                        print(f"    {key}: {value[:100] if len(str(value)) > 100 else value}")
+
+            return html_content
         except Exception as e:
             print(f"\n✗ Error fetching page: {e}")
             import traceback
             traceback.print_exc()
             sys.exit(1)
 
+    def get_page(self, url, headers=None):
+        """GET a page, revalidating it against the response cache.
+
+        Returns the response and the page text, which comes from the cache
+        when the server answers 304 Not Modified.
+        """
+        request_headers = dict(headers or {})
+        request_headers.update(self.cache.conditional_headers(url))
+
+        response = self.session.get(url, headers=request_headers, timeout=30, allow_redirects=True, verify=True)
+        if response.status_code == 304:
+            return response, self.cache.read_text(url)
+
+        response.raise_for_status()
+        self.cache.store_text(url, response)
+        return response, response.text
+
     def extract_images(self, html_content):
         """Extract image URLs from HTML content with multiple strategies."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=self._IMAGE_TAGS)
 
         # Extract page title
         title_tag = soup.find('title')
         self.page_title = title_tag.text.strip() if title_tag else "Downloaded_Images"
 
         # Clean title for filename
-        self.page_title = re.sub(r'[<>:"/\\|?*]', '_', self.page_title)
+        self.page_title = self.page_title.translate(self._TITLE_UNSAFE)
 
         print(f"Page title: {self.page_title}")
 
@@ -176,33 +576,29 @@ class ImageToPDFDownloader:
             print("🔍 Detected paginated gallery (one image per page)")
             return self.extract_paginated_images(html_content)
 
-        image_urls = []
-
-        # Strategy 1: Check for noscript tags (common for JavaScript galleries)
-        noscript_tags = soup.find_all('noscript')
-        for noscript in noscript_tags:
-            noscript_soup = BeautifulSoup(str(noscript), 'html.parser')
-            noscript_imgs = noscript_soup.find_all('img', {'src': True})
-            for img in noscript_imgs:
-                src = img.get('src')
-                if src and self.is_image_url(src.strip()):
-                    image_urls.append(src.strip())
-
-        # Strategy 2: Find all img tags with data-src attribute
-        if not image_urls:
-            img_tags = soup.find_all('img', {'data-src': True})
-            for img in img_tags:
-                src = img.get('data-src')
-                if src and self.is_image_url(src.strip()):
-                    image_urls.append(src.strip())
-
-        # Strategy 3: Fallback to regular src attribute
-        if not image_urls:
-            img_tags = soup.find_all('img', {'src': True})
-            for img in img_tags:
-                src = img.get('src')
-                if src and self.is_image_url(src.strip()):
-                    image_urls.append(src.strip())
+        # Collect the candidates for every strategy in a single pass. With the
+        # strainer, images outside noscript tags are top-level nodes, so no
+        # parent lookup is needed to tell the two apart.
+        noscript_urls = []
+        data_src_urls = []
+        src_urls = []
+        for tag in soup.find_all(['noscript', 'img'], recursive=False):
+            in_noscript = tag.name == 'noscript'
+            for img in tag.find_all('img') if in_noscript else [tag]:
+                src = (img.get('src') or '').strip()
+                if src and self.is_image_url(src):
+                    src_urls.append(src)
+                    if in_noscript:
+                        noscript_urls.append(src)
+
+                data_src = (img.get('data-src') or '').strip()
+                if data_src and self.is_image_url(data_src):
+                    data_src_urls.append(data_src)
+
+        # Strategy 1: Images in noscript tags (common for JavaScript galleries)
+        # Strategy 2: Lazy-loaded images with a data-src attribute
+        # Strategy 3: Fallback to the regular src attribute
+        image_urls = noscript_urls or data_src_urls or src_urls
 
         # Clean URLs to get full-size images
         image_urls = [self.clean_image_url(url) for url in image_urls]
@@ -225,8 +621,6 @@ class ImageToPDFDownloader:
 
     def is_paginated_gallery(self, html_content):
         """Detect if this is a paginated gallery (one image per page with Next/Previous buttons)."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-
         # Look for pagination indicators
         pagination_indicators = [
             'Next Image',
@@ -241,12 +635,9 @@ class ImageToPDFDownloader:
             if indicator.lower() in text_content:
                 return True
 
-        # Look for navigation controls
-        nav_divs = soup.find_all('div', {'id': re.compile(r'control', re.I)})
-        if nav_divs:
-            return True
-
-        return False
+        # Look for navigation controls, only building the matching divs
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=self._CONTROL_DIVS)
+        return soup.find('div') is not None
 
     def extract_paginated_images(self, html_content):
         """Extract images from paginated gallery by crawling through all pages."""
@@ -256,9 +647,6 @@ class ImageToPDFDownloader:
         visited_urls = set()
         current_url = self.url
 
-        # Parse the initial page structure to understand the URL pattern
-        base_pattern = self.detect_url_pattern(current_url)
-
         page_number = 1
         max_pages = 200  # Safety limit
 
@@ -272,11 +660,9 @@ class ImageToPDFDownloader:
                     # Use already fetched content for first page
                     page_html = html_content
                 else:
-                    response = self.session.get(current_url, timeout=30)
-                    response.raise_for_status()
-                    page_html = response.text
+                    _, page_html = self.get_page(current_url)
 
-                soup = BeautifulSoup(page_html, 'html.parser')
+                soup = BeautifulSoup(page_html, HTML_PARSER)
 
                 # Extract the main image from this page
                 image_url = self.extract_main_image(soup)
@@ -284,7 +670,7 @@ class ImageToPDFDownloader:
                     all_image_urls.append(image_url)
                     print(f"    ✓ Found image: {image_url.split('/')[-1][:50]}")
                 else:
-                    print(f"    ⚠ No image found on this page")
+                    print("    ⚠ No image found on this page")
 
                 # Find the "Next" link
                 next_url = self.find_next_page_url(soup, current_url)
@@ -293,12 +679,22 @@ class ImageToPDFDownloader:
                     print(f"\n✓ Reached end of gallery at page {page_number}")
                     break
 
+                # Numbered pages (-02/, -03/, ...) don't need to be discovered one
+                # by one, so fetch the rest of them concurrently. Only when the
+                # next link is the following page of this same URL, so an ID
+                # like /photo-4822/ isn't mistaken for a page number.
+                numbered = self.detect_numbered_pages(next_url)
+                if (numbered and numbered[1] == page_number + 1
+                        and numbered[0] == self.detect_url_pattern(current_url)):
+                    base_url, next_page = numbered
+                    page_number = self.crawl_numbered_pages(
+                        base_url, next_page, max_pages - page_number, all_image_urls
+                    )
+                    break
+
                 current_url = next_url
                 page_number += 1
 
-                # Small delay to be respectful
-                time.sleep(0.3)
-
             except Exception as e:
                 print(f"    ✗ Error on page {page_number}: {e}")
                 break
@@ -308,28 +704,101 @@ class ImageToPDFDownloader:
 
         return all_image_urls
 
+    def crawl_numbered_pages(self, base_url, first_page, max_pages, image_urls):
+        """Fetch numbered gallery pages concurrently, appending their images in page order.
+
+        Pages are requested in batches of 8 and the crawl stops at the first page
+        that is missing (404), redirects to another path, or repeats an image.
+        Pages without a detectable image are skipped.
+        Returns the number of the last page that was crawled.
+        """
+        seen = set(image_urls)
+        redirected = object()  # Marker for pages that don't exist
+
+        def fetch_main_image(page_url):
+            response, page_html = self.get_page(page_url)
+            # Only the path matters, sites may move every page to https or www
+            if urlparse(response.url).path.rstrip('/') != urlparse(page_url).path.rstrip('/'):
+                # Redirected away: the gallery has no such page
+                return redirected
+            return self.extract_main_image(BeautifulSoup(page_html, HTML_PARSER))
+
+        last_page = first_page + max_pages - 1
+        page_number = first_page
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            while page_number <= last_page:
+                batch = range(page_number, min(page_number + 8, last_page + 1))
+                page_urls = [self.numbered_page_url(base_url, n) for n in batch]
+                futures = [executor.submit(fetch_main_image, url) for url in page_urls]
+
+                for page_number, page_url, future in zip(batch, page_urls, futures):
+                    try:
+                        image_url = future.result()
+                    except requests.HTTPError as e:
+                        if e.response is not None and e.response.status_code == 404:
+                            print(f"\n✓ Reached end of gallery at page {page_number - 1}")
+                        else:
+                            print(f"    ✗ Error on page {page_number}: {e}")
+                        return page_number - 1
+                    except Exception as e:
+                        print(f"    ✗ Error on page {page_number}: {e}")
+                        return page_number - 1
+
+                    if image_url is redirected or image_url in seen:
+                        print(f"\n✓ Reached end of gallery at page {page_number - 1}")
+                        return page_number - 1
+
+                    print(f"\n  📄 Page {page_number}: {page_url}")
+                    if not image_url:
+                        print("    ⚠ No image found on this page")
+                        continue
+                    seen.add(image_url)
+                    image_urls.append(image_url)
+                    print(f"    ✓ Found image: {image_url.split('/')[-1][:50]}")
+
+                page_number += 1
+
+        return last_page
+
     def detect_url_pattern(self, url):
         """Detect the URL pattern for pagination."""
         # Extract base URL without the page number
         # Example: /comic/chapter-01/ or /comic/chapter-01-page-5/
-        match = re.search(r'(.*?)(-\d+)?/?$', url)
+        match = self._RE_URL_PATTERN.search(url)
         if match:
             return match.group(1)
         return url
 
+    def detect_numbered_pages(self, url):
+        """Return (base_url, page_number) if the URL is a numbered page like /chapter-02/."""
+        base_url = self.detect_url_pattern(url)
+        page = url[len(base_url):].strip('-/')
+        if not page.isdigit():
+            return None
+
+        page_number = int(page)
+        # Only trust the pattern if it reproduces the URL exactly
+        if self.numbered_page_url(base_url, page_number) != url:
+            return None
+        return base_url, page_number
+
+    def numbered_page_url(self, base_url, page_number):
+        """Build the URL of a numbered gallery page."""
+        return f"{base_url}-{page_number:02d}/"
+
     def extract_main_image(self, soup):
         """Extract the main/primary image from a single page."""
         # Try multiple strategies to find the main image
 
         # Strategy 1: Look for images in main content area
-        main_content = soup.find(['div', 'article'], {'id': re.compile(r'content|main|comic|image', re.I)})
+        main_content = soup.find(['div', 'article'], {'id': self._RE_CONTENT_ID})
         if main_content:
             img = main_content.find('img', {'src': True})
             if img and self.is_image_url(img.get('src', '').strip()):
                 return self.clean_image_url(img.get('src').strip())
 
         # Strategy 2: Look for images with specific classes
-        img = soup.find('img', {'class': re.compile(r'main|comic|content|gallery|primary', re.I), 'src': True})
+        img = soup.find('img', {'class': self._RE_MAIN, 'src': True})
         if img and self.is_image_url(img.get('src', '').strip()):
             return self.clean_image_url(img.get('src').strip())
 
@@ -371,17 +840,15 @@ class ImageToPDFDownloader:
     def find_next_page_url(self, soup, current_url):
         """Find the URL of the next page in pagination."""
         # Strategy 1: Look for links with "Next" text
-        next_keywords = ['next image', 'next page', 'next >>', '>>']
-
-        for keyword in next_keywords:
-            links = soup.find_all('a', string=re.compile(keyword, re.I))
+        for keyword in self._RE_NEXT_TEXT:
+            links = soup.find_all('a', string=keyword)
             for link in links:
                 href = link.get('href')
                 if href:
                     return self.normalize_url(href, current_url)
 
         # Strategy 2: Look for links inside elements with "next" classes
-        next_elements = soup.find_all(['a', 'span'], {'class': re.compile(r'next|pagGaleria', re.I)})
+        next_elements = soup.find_all(['a', 'span'], {'class': self._RE_NEXT_CLS})
         for elem in next_elements:
             if elem.name == 'a':
                 href = elem.get('href')
@@ -396,7 +863,7 @@ class ImageToPDFDownloader:
                         return self.normalize_url(href, current_url)
 
         # Strategy 3: Look for numbered pagination (increment current page number)
-        match = re.search(r'(.*?)[-/](\d+)/?$', current_url)
+        match = self._RE_PAGINATE.search(current_url)
         if match:
             base_url = match.group(1)
             current_page = int(match.group(2))
@@ -415,12 +882,11 @@ class ImageToPDFDownloader:
             return href
 
         # Parse current URL to get base
-        from urllib.parse import urljoin
         return urljoin(current_url, href)
 
     def detect_related_chapters(self, html_content):
         """Detect related chapters/parts of the same story from select dropdown."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=self._SELECT_TAGS)
 
         # Look for chapter select dropdown
         select_elem = soup.find('select', {'class': 'single-chapter-select'})
@@ -475,22 +941,21 @@ class ImageToPDFDownloader:
         return None
 
     def is_image_url(self, url):
-        """Check if URL points to an image."""
-        image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
-        return any(url.lower().endswith(ext) for ext in image_extensions)
+        """Check if URL points to an image, ignoring any query string or fragment."""
+        return self._RE_IMAGE_EXT.search(url) is not None
 
     def clean_image_url(self, url):
         """Clean image URL to get full-size version."""
         # Remove common image resizing paths
         # Example: /styles/juicebox_medium/public/ -> /
-        url = re.sub(r'/styles/[^/]+/public/', '/', url)
+        url = self._RE_STYLES.sub('/', url)
 
         # Remove query parameters that might cause issues (keep the base URL)
         # But preserve the essential parts like itok for authentication
         if '?' in url:
             base_url = url.split('?')[0]
             # Check if there's an itok parameter (image token for Drupal sites)
-            itok_match = re.search(r'[?&]itok=([^&]+)', url)
+            itok_match = self._RE_ITOK.search(url)
             if itok_match:
                 url = f"{base_url}?itok={itok_match.group(1)}"
             else:
@@ -505,17 +970,17 @@ class ImageToPDFDownloader:
 
         # Try to find numbers in the filename
         # Pattern 1: Leading numbers like "01_", "001_", "1_"
-        match = re.search(r'^(\d+)[\W_]', filename)
+        match = self._RE_LEADING_NUM.search(filename)
         if match:
             return int(match.group(1))
 
         # Pattern 2: Numbers after underscore like "_01.", "_001.", "_1."
-        match = re.search(r'[\W_](\d+)\.', filename)
+        match = self._RE_UNDER_NUM.search(filename)
         if match:
             return int(match.group(1))
 
         # Pattern 3: Any number in the filename
-        match = re.search(r'(\d+)', filename)
+        match = self._RE_ANY_NUM.search(filename)
         if match:
             return int(match.group(1))
 
@@ -527,163 +992,374 @@ class ImageToPDFDownloader:
         if not image_urls:
             return image_urls
 
-        # Check if URLs contain numbers that suggest ordering
-        urls_with_numbers = []
-        for url in image_urls:
-            number = self.extract_number_from_filename(url)
-            urls_with_numbers.append((number, url))
-
-        # Sort by extracted number
-        urls_with_numbers.sort(key=lambda x: x[0])
-
-        # Extract sorted URLs
-        sorted_urls = [url for _, url in urls_with_numbers]
+        # Sort in place by the number in the filename (stable for ties)
+        image_urls.sort(key=self.extract_number_from_filename)
 
         # Debug: Show sorting
         print(f"📊 Image ordering detected:")
-        for idx, (num, url) in enumerate(urls_with_numbers[:5], 1):
+        for idx, url in enumerate(image_urls[:5], 1):
+            num = self.extract_number_from_filename(url)
             filename = url.split('/')[-1].split('?')[0]
             if num != float('inf'):
                 print(f"  [{idx}] Number: {num:3d} - {filename[:50]}...")
             else:
                 print(f"  [{idx}] No number - {filename[:50]}...")
-        if len(urls_with_numbers) > 5:
-            print(f"  ... and {len(urls_with_numbers) - 5} more images")
+        if len(image_urls) > 5:
+            print(f"  ... and {len(image_urls) - 5} more images")
 
-        return sorted_urls
+        return image_urls
 
     def download_images(self, image_urls):
-        """Download all images using multi-threading for speed."""
+        """Download all images using multi-threading and prepare them as they arrive.
+
+        Finished downloads are handed to a decoder pool sized to the CPU count.
+        Pillow releases the GIL while decoding and converting, so images that
+        need converting are processed on all cores, overlapping with the
+        downloads still in flight.
+        """
         print("\nDownloading images with multi-threading...")
-        downloaded_files = [None] * len(image_urls)  # Pre-allocate list to maintain order
-        lock = Lock()
+        self.http2_blocked = False
+        pages = [None] * len(image_urls)  # Pre-allocate list to maintain order
+        decoder = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        progress = tqdm(total=len(image_urls), unit='img', desc='  Downloading')
+
+        def prepare_downloaded_image(idx, img_url, buffer):
+            with buffer:
+                page = self.prepare_page(buffer, idx)
+            if page is None:
+                # Don't let an unusable body be served again on the next run
+                self.cache.evict(img_url)
+            return page
 
         def download_single_image(args):
             idx, img_url = args
             try:
-                response = self.session.get(img_url, timeout=30)
-                response.raise_for_status()
-
-                # Save to temporary file
-                file_ext = os.path.splitext(img_url)[1] or '.jpg'
-                temp_file = os.path.join(self.temp_dir, f"{idx:03d}{file_ext}")
-
-                with open(temp_file, 'wb') as f:
-                    f.write(response.content)
+                buffer = self.fetch_image(img_url, client)
+                pages[idx - 1] = decoder.submit(prepare_downloaded_image, idx, img_url, buffer)
 
-                with lock:
-                    downloaded_files[idx - 1] = temp_file
-                    print(f"  [{idx}/{len(image_urls)}] ✓ Downloaded: {os.path.basename(img_url)}")
+                if self.verbose:
+                    progress.write(f"  [{idx}/{len(image_urls)}] ✓ Downloaded: {os.path.basename(img_url)}")
 
                 return True
             except Exception as e:
-                with lock:
-                    print(f"  [{idx}/{len(image_urls)}] ✗ Failed: {os.path.basename(img_url)} - {e}")
+                progress.write(f"  [{idx}/{len(image_urls)}] ✗ Failed: {os.path.basename(img_url)} - {e}")
                 return False
+            finally:
+                # tqdm is thread-safe, so no lock is needed around progress updates
+                progress.update(1)
 
-        # Use ThreadPoolExecutor for parallel downloads (8 threads)
-        with ThreadPoolExecutor(max_workers=8) as executor:
-            futures = [executor.submit(download_single_image, (idx, url)) for idx, url in enumerate(image_urls, 1)]
-            completed = sum(1 for future in as_completed(futures) if future.result())
+        try:
+            with self.open_image_client() as client:
+                # Connect to the image host once before the burst, so the pool holds a keep-alive
+                # connection instead of every worker resolving and handshaking at once.
+                # Not needed when every image is already cached.
+                if not all(self.cache.contains(url) for url in image_urls):
+                    self.warm_up_connection(image_urls[0], client)
+
+                # One thread per image for small chapters, up to 32 for large ones
+                # so slow responses don't leave the connection idle
+                workers = self.max_workers or min(32, max(2, len(image_urls)))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(download_single_image, (idx, url)) for idx, url in enumerate(image_urls, 1)]
+                    completed = sum(1 for future in as_completed(futures) if future.result())
+        finally:
+            progress.close()
+            decoder.shutdown(wait=True)
+
+        print(f"✓ Successfully downloaded {completed}/{len(image_urls)} images")
+
+        # Filter out failed downloads and conversions
+        pages = [page.result() for page in pages if page is not None]
+        return [page for page in pages if page is not None]
+
+    def open_image_client(self):
+        """Return a context manager providing the client used for image downloads.
+
+        With httpx available this is an HTTP/2 client sharing the session's
+        cookies and headers, so all image requests to a host are multiplexed
+        over one connection. Otherwise it is the session itself.
+        """
+        if not HAS_HTTPX:
+            return contextlib.nullcontext(self.session)
+
+        # Connection-specific headers are not allowed over HTTP/2, and httpx
+        # negotiates its own Accept-Encoding
+        headers = {
+            key: value for key, value in self.session.headers.items()
+            if key.lower() not in ('connection', 'accept-encoding')
+        }
+        return httpx.Client(
+            http2=True,
+            headers=headers,
+            cookies=self.session.cookies,
+            follow_redirects=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+        )
+
+    def fetch_image(self, url, client):
+        """Download one image and return a readable buffer with its bytes.
+
+        Images the HTTP/2 client fails to fetch are retried through the
+        session, which can get past Cloudflare challenges. Once the host
+        answers the client with 403 or 503 (its TLS fingerprint is blocked),
+        the rest of the chapter goes straight through the session. Other 4xx
+        responses are final and not retried, except 429 Too Many Requests,
+        which is retried through the session like a server error.
+        """
+        if client is not self.session and not self.http2_blocked:
+            try:
+                return self._fetch_image(url, client)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status in (403, 503):
+                    self.http2_blocked = True
+                elif 400 <= status < 500 and status != 429:
+                    raise
+            except Exception:
+                pass
+        return self._fetch_image(url, self.session)
+
+    def _fetch_image(self, url, client):
+        headers = self.cache.conditional_headers(url)
+        if not headers and self.cache.contains(url):
+            # Cached without validators, there is nothing to revalidate with
+            return self.cache.open(url)
+
+        with self.stream_image(url, client, headers) as (response, chunks):
+            if response.status_code == 304:
+                # Unchanged since the last run, reuse the cached copy
+                return self.cache.open(url)
 
-        # Filter out None values (failed downloads)
-        downloaded_files = [f for f in downloaded_files if f is not None]
+            response.raise_for_status()
+            if response.headers.get('Content-Type', '').startswith('text/'):
+                # An error or login page served with a 200 status
+                raise ValueError(f"got {response.headers['Content-Type']} instead of an image")
+            return self.cache.store_stream(url, response, chunks, check=self.is_image_file)
 
-        print(f"✓ Successfully downloaded {len(downloaded_files)}/{len(image_urls)} images")
-        return downloaded_files
+    def is_image_file(self, path):
+        """Check whether Pillow recognizes the file as an image (only the header is read)."""
+        try:
+            with Image.open(path):
+                return True
+        except Exception:
+            return False
+
+    @contextlib.contextmanager
+    def stream_image(self, url, client, headers):
+        """Stream a GET through the session or the HTTP/2 client.
+
+        Yields the response and an iterator over its decoded body, read in
+        64 KiB chunks instead of materializing the whole image at once.
+        """
+        if client is self.session:
+            with self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+                yield response, response.iter_content(64 * 1024)
+        else:
+            with client.stream('GET', url, headers=headers) as response:
+                yield response, response.iter_bytes(64 * 1024)
 
-    def create_pdf(self, image_files, output_filename):
-        """Create PDF from downloaded images."""
-        if not image_files:
-            print("✗ No images to convert to PDF")
+    def warm_up_connection(self, url, client):
+        """Open a pooled keep-alive connection to the host serving url."""
+        if not urlparse(url).netloc:
+            return
+        try:
+            client.head(url, timeout=10)
+        except Exception:
+            pass  # Best effort, the downloads will connect on their own
+
+    def prepare_page(self, buffer, idx):
+        """Return a downloaded image ready to be embedded as a PDF page.
+
+        JPEGs and opaque PNGs are returned as the path of their cached file so
+        img2pdf reads and embeds them once, without decoding or re-encoding.
+        Anything else (alpha channels, GIF, WEBP, BMP, ...) or anything wider
+        than max_dim is flattened to RGB with Pillow, scaled down and encoded
+        as JPEG bytes.
+        """
+        try:
+            header = buffer.read(32)
+            buffer.seek(0, os.SEEK_END)
+            buffer.seek(max(buffer.tell() - 12, 0))
+            tail = buffer.read()
+            buffer.seek(0)
+
+            # Only this page is decoded, straight from the cached file, and its
+            # pixels are released as soon as the JPEG is encoded. The PDF only
+            # ever holds compressed data.
+            with Image.open(buffer) as img:  # Only parses the header
+                if not self.is_too_wide(img) and self.can_embed(header, tail):
+                    return Path(buffer.name)
+                return self.encode_page(img)
+        except Exception as e:
+            # Runs on the decoder pool while the progress bar is drawn
+            tqdm.write(f"  ⚠ Warning: Could not process image {idx}: {e}")
+            return None
+
+    def encode_page(self, img):
+        """Flatten an opened image to RGB, scale it down to max_dim wide and return it as JPEG bytes."""
+        too_wide = self.is_too_wide(img)
+        if too_wide:
+            # Let libjpeg decode straight to a reduced scale (no-op for other formats)
+            scale = self.max_dim / self.page_width(img)
+            img.draft(img.mode, (int(img.width * scale), int(img.height * scale)))
+
+        pages = [ImageOps.exif_transpose(img)]
+        try:
+            if too_wide:
+                # Only the width is capped, so long strip pages keep a readable width
+                pages[0].thumbnail((self.max_dim, pages[0].height), Image.LANCZOS)
+            pages.append(self.flatten(pages[0]))
+            output = BytesIO()
+            pages[-1].save(output, 'JPEG', quality=85, optimize=False)
+        finally:
+            for page in pages:
+                if page is not img:
+                    page.close()
+        return output.getvalue()
+
+    def is_too_wide(self, img):
+        """Check whether a page is wider than max_dim and needs scaling down."""
+        return bool(self.max_dim) and self.page_width(img) > self.max_dim
+
+    def page_width(self, img):
+        """Return the width of an image as displayed, after its EXIF rotation."""
+        # getexif() loads the whole image when its EXIF is stored after the pixel
+        # data (as in PNG), so only look it up when the header already carried it
+        if img.format != 'JPEG' and 'exif' not in img.info:
+            return img.width
+        # Orientations 5-8 rotate the image by 90 degrees
+        if img.getexif().get(0x0112) in (5, 6, 7, 8):
+            return img.height
+        return img.width
+
+    def flatten(self, img):
+        """Return img as an RGB or grayscale image that JPEG can store."""
+        # JPEG stores RGB and grayscale as-is, only other modes need converting
+        if img.mode in ('RGB', 'L'):
+            return img
+
+        # Palette images only need compositing if they have a transparent colour
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            # Composite transparency onto a white background
+            rgba = img.convert('RGBA') if img.mode == 'P' else img
+            page = Image.new('RGB', img.size, (255, 255, 255))
+            page.paste(rgba, mask=rgba.split()[-1])
+            if rgba is not img:
+                rgba.close()
+            return page
+
+        return img.convert('RGB')
+
+    def can_embed(self, header, tail):
+        """Check the magic bytes for images img2pdf can embed without re-encoding.
+
+        header is the start of the file and tail its last 12 bytes.
+        """
+        if header.startswith(b'\xff\xd8\xff'):
+            return True  # JPEG
+
+        # PNG: IHDR bit depth and colour type sit at bytes 24 and 25. 8-bit
+        # grayscale (0) and RGB (2) have no alpha channel or palette. img2pdf
+        # copies the image data as-is, so the file must also end in the IEND
+        # chunk; truncated ones go through Pillow, which can still load them.
+        if header.startswith(b'\x89PNG\r\n\x1a\n') and len(header) > 25:
+            return header[24] == 8 and header[25] in (0, 2) and tail == self._PNG_IEND
+
+        return False
+
+    def create_pdf(self, pages, output_filename):
+        """Create PDF from prepared page images."""
+        if not pages:
+            print("✗ No valid images to create PDF")
             return
 
         print(f"\nCreating PDF: {output_filename}")
 
+        # Write next to the target and move it into place once complete, so a
+        # failure never leaves a truncated or empty PDF behind
+        partial_filename = f"{output_filename}.part"
         try:
-            # Convert all images to RGB PIL Images
-            pil_images = []
-            for img_file in image_files:
-                try:
-                    img = Image.open(img_file)
-                    # Convert to RGB if necessary
-                    if img.mode in ('RGBA', 'LA', 'P'):
-                        rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'P':
-                            img = img.convert('RGBA')
-                        rgb_img.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                        img = rgb_img
-                    elif img.mode != 'RGB':
-                        img = img.convert('RGB')
-
-                    pil_images.append(img)
-                except Exception as e:
-                    print(f"  ⚠ Warning: Could not process {img_file}: {e}")
-
-            if not pil_images:
-                print("✗ No valid images to create PDF")
-                return
-
-            # Save as PDF
-            pil_images[0].save(
-                output_filename,
-                "PDF",
-                resolution=100.0,
-                save_all=True,
-                append_images=pil_images[1:]
-            )
+            try:
+                self.write_pdf(pages, partial_filename)
+            except Exception as e:
+                # One bad page fails the whole document, find it and retry without it
+                print(f"  ⚠ {e}, checking pages individually")
+                pages = self.repair_pages(pages)
+                if not pages:
+                    raise ValueError("no page could be embedded")
+                self.write_pdf(pages, partial_filename)
+            os.replace(partial_filename, output_filename)
 
             print(f"✓ PDF created successfully: {output_filename}")
-            print(f"  Total pages: {len(pil_images)}")
+            print(f"  Total pages: {len(pages)}")
 
         except Exception as e:
+            if os.path.exists(partial_filename):
+                os.remove(partial_filename)
             print(f"✗ Error creating PDF: {e}")
 
-    def cleanup(self):
-        """Clean up temporary files."""
-        try:
-            import shutil
-            shutil.rmtree(self.temp_dir)
-        except Exception as e:
-            print(f"⚠ Warning: Could not clean up temporary files: {e}")
+    def write_pdf(self, pages, filename):
+        """Write pages to a PDF with img2pdf."""
+        # img2pdf embeds the JPEG/PNG streams directly, no re-encoding.
+        # Pages are laid out at 100 DPI, matching the previous Pillow output.
+        with open(filename, 'wb') as f:
+            img2pdf.convert(pages, outputstream=f, layout_fun=img2pdf.get_fixed_dpi_layout_fun((100, 100)))
+
+    def repair_pages(self, pages):
+        """Re-encode the pages img2pdf rejects through Pillow, dropping those Pillow can't read either."""
+        repaired = []
+        for idx, page in enumerate(pages, 1):
+            try:
+                img2pdf.convert(page)
+                repaired.append(page)
+                continue
+            except Exception as e:
+                error = e
+
+            try:
+                with Image.open(page if isinstance(page, Path) else BytesIO(page)) as img:
+                    repaired.append(self.encode_page(img))
+                print(f"  ⚠ Re-encoded page {idx}: {error}")
+            except Exception:
+                print(f"  ⚠ Skipping page {idx}: {error}")
+        return repaired
 
     def run(self, download_related=True):
         """Main execution flow."""
-        try:
-            # Fetch page
-            html_content = self.fetch_page()
-
-            # Detect related chapters
-            related_chapters = []
-            if download_related:
-                related_chapters = self.detect_related_chapters(html_content)
-
-            # Download current chapter and related chapters if found
-            self.download_chapter(html_content, is_main=True)
-
-            # Download related chapters
-            if related_chapters:
-                while True:
-                    response = input(f"\n⭐ Found {len(related_chapters)} related chapters/parts. Download them all? (yes/no): ").strip().lower()
-                    if response in ['yes', 'y']:
-                        print(f"\n📦 Downloading {len(related_chapters)} related chapters...")
-                        for idx, chapter in enumerate(related_chapters, 1):
-                            print(f"\n[{idx}/{len(related_chapters)}] Downloading: {chapter['name']}")
-                            try:
-                                # Create a new downloader for each related chapter
-                                related_downloader = ImageToPDFDownloader(chapter['url'], self.cookies_file)
-                                related_downloader.download_chapter(related_downloader.fetch_page(), is_main=False)
-                            except Exception as e:
-                                print(f"  ✗ Failed to download: {e}")
-                        break
-                    elif response in ['no', 'n']:
-                        break
-                    else:
-                        print("Please enter 'yes' or 'no'")
+        # Fetch page
+        html_content = self.fetch_page()
 
-        finally:
-            # Cleanup
-            self.cleanup()
+        # Detect related chapters
+        related_chapters = []
+        if download_related:
+            related_chapters = self.detect_related_chapters(html_content)
+
+        # Download current chapter and related chapters if found
+        self.download_chapter(html_content, is_main=True)
+
+        # Download related chapters
+        if related_chapters:
+            while True:
+                response = input(f"\n⭐ Found {len(related_chapters)} related chapters/parts. Download them all? (yes/no): ").strip().lower()
+                if response in ['yes', 'y']:
+                    print(f"\n📦 Downloading {len(related_chapters)} related chapters...")
+                    for idx, chapter in enumerate(related_chapters, 1):
+                        print(f"\n[{idx}/{len(related_chapters)}] Downloading: {chapter['name']}")
+                        try:
+                            # Create a new downloader for each related chapter, sharing this session
+                            related_downloader = ImageToPDFDownloader(
+                                chapter['url'], self.cookies_file, self.verbose, self.max_dim,
+                                max_workers=self.max_workers, session=self.session
+                            )
+                            related_downloader.download_chapter(related_downloader.fetch_page(), is_main=False)
+                        except Exception as e:
+                            print(f"  ✗ Failed to download: {e}")
+                    break
+                elif response in ['no', 'n']:
+                    break
+                else:
+                    print("Please enter 'yes' or 'no'")
 
     def download_chapter(self, html_content, is_main=True):
         """Download images from a chapter and create PDF."""
@@ -694,20 +1370,30 @@ class ImageToPDFDownloader:
             print("✗ No images found on the page")
             return
 
-        # Download images
-        downloaded_files = self.download_images(image_urls)
+        # Download and convert images
+        pages = self.download_images(image_urls)
 
-        if not downloaded_files:
+        if not pages:
             print("✗ No images were successfully downloaded")
             return
 
         # Create PDF
         output_filename = f"{self.page_title}.pdf"
-        self.create_pdf(downloaded_files, output_filename)
+        self.create_pdf(pages, output_filename)
+
+        # Keep the cache within its limit as bulk runs add chapter after chapter,
+        # only once the PDF is written since embedded pages are read from it
+        if self.cache.cache_dir == CACHE_DIR:
+            with contextlib.suppress(OSError):
+                self.cache.prune(CACHE_LIMIT)
 
 
 def select_cookies_file():
     """Open file dialog to select cookies file."""
+    # Imported here so runs that never open a dialog don't load Tk
+    import tkinter as tk
+    from tkinter import filedialog
+
     # Create a hidden root window
     root = tk.Tk()
     root.withdraw()
@@ -738,6 +1424,9 @@ def select_cookies_file():
 
 def select_bulk_file():
     """Open file dialog to select bulk links file."""
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     root.attributes('-topmost', True)
@@ -782,7 +1471,47 @@ def load_urls_from_file(file_path):
         return []
 
 
+def positive_int(value):
+    """argparse type for options that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def non_negative_int(value):
+    """argparse type for options that must be 0 or more."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Download the images on a webpage into a PDF")
+    parser.add_argument(
+        '--concurrency', type=positive_int, default=None,
+        help="number of concurrent image downloads (default: one per image, up to 32)"
+    )
+    parser.add_argument(
+        '--max-dim', type=non_negative_int, default=2000,
+        help="scale pages wider than this many pixels down to it, 0 keeps every page as-is (default: 2000)"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help=f"don't keep downloaded pages, images and cookies in {CACHE_DIR}"
+    )
+    args = parser.parse_args()
+
+    if args.no_cache:
+        disable_persistent_cache()
+
     print("=" * 60)
     print("Web Image to PDF Downloader")
     print("=" * 60)
@@ -806,9 +1535,9 @@ def main():
         mode = input("\nSelect mode (1/2/3): ").strip()
 
         if mode == '1':
-            download_single_mode(cookies_file)
+            download_single_mode(cookies_file, args.concurrency, args.max_dim or None)
         elif mode == '2':
-            download_bulk_mode(cookies_file)
+            download_bulk_mode(cookies_file, args.concurrency, args.max_dim or None)
         elif mode == '3':
             print("\n" + "=" * 60)
             print("Thank you! Exiting...")
@@ -818,7 +1547,7 @@ def main():
             print("Invalid choice. Please enter 1, 2, or 3")
 
 
-def download_single_mode(cookies_file):
+def download_single_mode(cookies_file, max_workers=None, max_dim=2000):
     """Handle single URL downloads."""
     print("\n" + "=" * 60)
     print("Single Download Mode")
@@ -835,7 +1564,7 @@ def download_single_mode(cookies_file):
             continue
 
         try:
-            downloader = ImageToPDFDownloader(url, cookies_file)
+            downloader = ImageToPDFDownloader(url, cookies_file, max_dim=max_dim, max_workers=max_workers)
             downloader.run()
 
         except Exception as e:
@@ -853,7 +1582,7 @@ def download_single_mode(cookies_file):
                 print("Please enter 'yes' or 'no'")
 
 
-def download_bulk_mode(cookies_file):
+def download_bulk_mode(cookies_file, max_workers=None, max_dim=2000):
     """Handle bulk downloads from a text file."""
     print("\n" + "=" * 60)
     print("Bulk Download Mode")
@@ -905,7 +1634,7 @@ def download_bulk_mode(cookies_file):
                 continue
 
         try:
-            downloader = ImageToPDFDownloader(url, cookies_file)
+            downloader = ImageToPDFDownloader(url, cookies_file, max_dim=max_dim, max_workers=max_workers)
             downloader.run()
             successful += 1
 